@@ -1,13 +1,28 @@
+import asyncio
+import functools
 import json
 import os
-from typing import Any, Dict, Optional
-from openai import OpenAI
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import orjson
+from openai import APIConnectionError, AsyncOpenAI, BadRequestError, OpenAI, RateLimitError
 
 DEFAULT_MODEL = "gpt-5"
 DEFAULT_OUTPUT_PATH = "reddit_posts.jsonl"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_CANDIDATES = 2
+RETRY_BACKOFF = 1.0
+TRANSIENT_ERRORS = (RateLimitError, APIConnectionError)
+BATCH_POLL_INTERVAL = 60
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
 REMOVE_KEYS = {"created_utc", "selection_reason", "full_prompt"}
-PROMPT_TEMPLATE = """You are fetching a single Reddit post for a guessing game.
-Use your browsing or retrieval tool to access Reddit and choose a real, verifiable post.
+PROMPT_TEMPLATE = """You are fetching Reddit posts for a guessing game.
+Use your browsing or retrieval tool to access Reddit and choose real, verifiable posts.
 Do not invent titles, text, scores, or URLs.
 
 Requirements:
@@ -38,47 +53,156 @@ Clue data (fetch these for game hints):
 - subreddit_created_year: Year the subreddit was founded (e.g., 2012)
 - subreddit_rule: One interesting/distinctive rule from the subreddit sidebar (e.g., "Rule 2: Posts must be about you")
 
-Return JSON only with these keys:
+Return JSON only. Each post is an object with these keys:
 subreddit, title, selftext, redacted_title, redacted_selftext, score, num_comments,
 post_id, permalink, source_url, redaction_notes, extra_redactions,
 upvote_ratio, top_comment, subreddit_subscribers, subreddit_created_year, subreddit_rule
 
-Return one post only.
+Return a JSON object of the form {{"posts": [...]}} with exactly {n} post(s),
+each from a different subreddit.
 """
-
-
-def build_prompt(
-) -> str:
-    return PROMPT_TEMPLATE
+SYSTEM_INSTRUCTIONS = """Every post you return is checked automatically and discarded if it fails:
+- It must be safe for work. Never return NSFW, sexual, pornographic, nude, gory or violent posts,
+  and avoid titles or text containing profanity.
+- Its score must be at least 1,000 in absolute value. Report the real score; never round up.
+If a candidate does not clearly meet both rules, skip it and find another post.
+"""
+_STRING = {"type": "string"}
+_INTEGER = {"type": "integer"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+POST_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "subreddit": _STRING,
+        "title": _STRING,
+        "selftext": _STRING,
+        "redacted_title": _STRING,
+        "redacted_selftext": _STRING,
+        "score": _INTEGER,
+        "num_comments": _INTEGER,
+        "post_id": _STRING,
+        "permalink": _STRING,
+        "source_url": _STRING,
+        "redaction_notes": _STRING_LIST,
+        "extra_redactions": _STRING_LIST,
+        "upvote_ratio": {"type": "number"},
+        "top_comment": _STRING,
+        "subreddit_subscribers": _INTEGER,
+        "subreddit_created_year": _INTEGER,
+        "subreddit_rule": _STRING,
+    },
+    "additionalProperties": False,
+}
+POST_SCHEMA["required"] = list(POST_SCHEMA["properties"])
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "name": "reddit_posts",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {"posts": {"type": "array", "items": POST_SCHEMA}},
+        "required": ["posts"],
+        "additionalProperties": False,
+    },
+}
+
+
+def build_prompt(n: int = 1) -> str:
+    return PROMPT_TEMPLATE.format(n=n)
+
+
+_ENV_LINE_RE = re.compile(
+    r"""^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(?:'([^'\n]*)'|"([^"\n]*)"|(.*?))[ \t]*\r?$""",
+    re.MULTILINE,
+)
 
 
 def _load_env(dotenv_path: str = ".env") -> None:
     try:
-        with open(dotenv_path, "r", encoding="utf-8") as handle:
-            for raw_line in handle:
-                line = raw_line.strip()
-                if not line or line.startswith("#") or "=" not in line:
-                    continue
-                key, value = line.split("=", 1)
-                key = key.strip()
-                value = value.strip().strip("'").strip('"')
-                if key:
-                    os.environ.setdefault(key, value)
+        data = Path(dotenv_path).read_text(encoding="utf-8")
     except FileNotFoundError:
         return
 
+    for match in _ENV_LINE_RE.finditer(data):
+        key, single, double, bare = match.groups()
+        value = single if single is not None else double if double is not None else bare
+        os.environ.setdefault(key, value)
+
     if "OPENAI_API_KEY" not in os.environ:
         alias = os.environ.get("GPT_KEY")
         if alias:
             os.environ["OPENAI_API_KEY"] = alias
 
 
-def _extract_json(text: str) -> Dict[str, Any]:
-    start = text.find("{")
-    end = text.rfind("}")
-    if start == -1 or end <= start:
-        raise ValueError("Model response did not contain a JSON object.")
-    return json.loads(text[start : end + 1])
+def _drop_removed_keys(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    return {key: value for key, value in pairs if key not in REMOVE_KEYS}
+
+
+# Filters REMOVE_KEYS while parsing, so discarded values never reach a post dict.
+_DECODER = json.JSONDecoder(object_pairs_hook=_drop_removed_keys)
+
+
+def _extract_json(text: str) -> List[Dict[str, Any]]:
+    # Decode in place from the first bracket; raw_decode stops at the end of
+    # the value, so trailing prose needs no separate scan.
+    for start in sorted(i for i in (text.find("["), text.find("{")) if i != -1):
+        try:
+            value, _ = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            if not isinstance(value.get("posts"), list):
+                return [value]
+            value = value["posts"]
+        if not isinstance(value, list):
+            continue
+        posts = [post for post in value if isinstance(post, dict)]
+        # A value with no posts (e.g. a "[1]" citation) is prose; try the next bracket.
+        if posts:
+            return posts
+    raise ValueError("Model response did not contain a JSON array or object.")
+
+
+def _iter_json_objects(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield objects from streamed JSON text as soon as each one is complete.
+
+    Tracks bracket depth outside of strings and yields each element object of
+    a root array or of an array directly inside the root object, so both a
+    bare array and the {"posts": [...]} wrapper stream post by post.
+    """
+    stack: List[str] = []
+    in_string = escaped = False
+    pieces: List[str] = []
+    depth = -1  # stack depth at which the object being captured started
+    for chunk in chunks:
+        start = 0
+        for index, char in enumerate(chunk):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                # Quotes in prose before the JSON starts are not strings.
+                in_string = bool(stack)
+            elif char == "[" or char == "{":
+                if char == "{" and depth < 0 and stack in (["["], ["{", "["]):
+                    depth = len(stack)
+                    start = index
+                stack.append(char)
+            elif (char == "]" or char == "}") and stack:
+                stack.pop()
+                if char == "}" and len(stack) == depth:
+                    pieces.append(chunk[start : index + 1])
+                    obj = _DECODER.decode("".join(pieces))
+                    pieces = []
+                    depth = -1
+                    if isinstance(obj, dict):
+                        yield obj
+        if depth >= 0:
+            pieces.append(chunk[start:])
 
 
 def _response_text(response: Any) -> str:
@@ -93,22 +217,42 @@ def _response_text(response: Any) -> str:
     return "".join(parts)
 
 
-def _clean_post(post: Dict[str, Any]) -> Dict[str, Any]:
-    return {key: value for key, value in post.items() if key not in REMOVE_KEYS}
+def _body_text(body: Dict[str, Any]) -> str:
+    """Same as _response_text, for a raw response body from a batch output file."""
+    if body.get("output_text"):
+        return body["output_text"]
+    parts = []
+    for item in body.get("output") or []:
+        for content in item.get("content") or []:
+            text = content.get("text")
+            if text:
+                parts.append(text)
+    return "".join(parts)
 
 
-def _format_subscribers(count: int) -> str:
+def _format_subscribers(count: Union[int, float]) -> str:
     """Format subscriber count as human-readable string."""
+    # Model output is not always typed (e.g. 19200000.0 on the plain-text path).
+    count = int(count)
     if count >= 1_000_000:
-        value = f"{count / 1_000_000:.1f}".rstrip("0").rstrip(".")
-        return f"{value}M"
-    if count >= 1_000:
-        value = f"{count / 1_000:.1f}".rstrip("0").rstrip(".")
-        return f"{value}K"
-    return str(count)
+        unit, suffix = 1_000_000, "M"
+    elif count >= 1_000:
+        unit, suffix = 1_000, "K"
+    else:
+        return str(count)
+    # Round to one decimal in integer arithmetic and drop a trailing ".0".
+    tenths, remainder = divmod(count * 10, unit)
+    if remainder * 2 == unit:
+        # Exact ties keep the float rounding the formatter always used.
+        tenths = int(f"{count / unit:.1f}".replace(".", ""))
+    elif remainder * 2 > unit:
+        tenths += 1
+    whole, tenth = divmod(tenths, 10)
+    return f"{whole}.{tenth}{suffix}" if tenth else f"{whole}{suffix}"
 
 
 INVALID_COMMENTS = {"[removed]", "[deleted]", ""}
+_INVALID_COMMENTS_LOWER = frozenset(s.lower() for s in INVALID_COMMENTS)
 
 
 def format_clues_for_game(post: Dict[str, Any]) -> Dict[str, str]:
@@ -116,15 +260,17 @@ def format_clues_for_game(post: Dict[str, Any]) -> Dict[str, str]:
     ratio = post.get("upvote_ratio", 0)
     upvote_ratio = f"{int(ratio * 100)}% upvoted" if ratio else "Unknown"
 
-    top_comment = post.get("top_comment", "")
+    # Fields come straight from model JSON; coerce them before they reach typed
+    # helpers, which the optional mypyc build checks at runtime.
+    top_comment = str(post.get("top_comment") or "")
     # Check if comment is invalid/removed
-    if top_comment.strip().lower() in {s.lower() for s in INVALID_COMMENTS}:
+    if top_comment.strip().lower() in _INVALID_COMMENTS_LOWER:
         top_comment = ""
     if len(top_comment) > 200:
         top_comment = top_comment[:197] + "..."
     top_comment = f'"{top_comment}"' if top_comment else "No valid comments"
 
-    subscribers = post.get("subreddit_subscribers", 0)
+    subscribers = int(post.get("subreddit_subscribers") or 0)
     year = post.get("subreddit_created_year", "")
     if subscribers and year:
         community_stats = f"{_format_subscribers(subscribers)} members, founded {year}"
@@ -143,29 +289,21 @@ def format_clues_for_game(post: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
+# Most tokens match anywhere in a word, like the substring check this replaced,
+# so "clusterfuck" and "bisexual" still hit. Tokens that also sit inside
+# innocent words ("grape", "Essex", "unisex") only match at a word start, and
+# "sex" must be a whole word.
+_NSFW_RE = re.compile(
+    r"nsfw|porn|fuck|pussy|sexual|explicit|nude|nudity|violence"
+    r"|\b(?:rape|gore|blood|dick|sex\b)",
+    re.IGNORECASE,
+)
+
+
 def _is_nsfw(text: str) -> bool:
     if not text:
         return False
-    lowered = text.lower()
-    return any(
-        token in lowered
-        for token in (
-            "nsfw",
-            "porn",
-            "sex ",
-            "sexual",
-            "explicit",
-            "nude",
-            "nudity",
-            "rape",
-            "gore",
-            "blood",
-            "violence",
-            "fuck",
-            "dick",
-            "pussy"
-        )
-    )
+    return bool(_NSFW_RE.search(text))
 
 
 def _ensure_sfw(post: Dict[str, Any]) -> None:
@@ -181,10 +319,58 @@ def _ensure_min_karma(post: Dict[str, Any], min_karma: int = 1000) -> None:
         raise ValueError(f"Post has {score} karma, need at least {min_karma}. Please retry.")
 
 
-def _append_post(post: Dict[str, Any], path: str = DEFAULT_OUTPUT_PATH) -> None:
-    with open(path, "a", encoding="utf-8") as handle:
-        handle.write(json.dumps(post, ensure_ascii=False))
-        handle.write("\n")
+class PostSink:
+    """Append posts as JSON lines through a single buffered file handle.
+
+    Use as a context manager. Records sit in the write buffer or the OS page
+    cache until the block exits, so a crash can lose anything written since
+    the last sync. Pass durable=True to fsync on exit, and sync_every=K to
+    also fsync after every K posts, bounding that loss window.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_OUTPUT_PATH,
+        buffering: int = 1 << 16,
+        durable: bool = False,
+        sync_every: int = 0,
+    ) -> None:
+        self.path = path
+        self.buffering = buffering
+        self.durable = durable
+        self.sync_every = sync_every
+        self._handle: Optional[BinaryIO] = None
+        self._unsynced = 0
+
+    def __enter__(self) -> "PostSink":
+        self._handle = open(self.path, "ab", buffering=self.buffering)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._handle is None:
+            return
+        try:
+            if self.durable:
+                self.sync()
+        finally:
+            self._handle.close()
+            self._handle = None
+
+    def append(self, post: Dict[str, Any]) -> None:
+        if self._handle is None:
+            raise RuntimeError("PostSink must be used as a context manager.")
+        self._handle.write(orjson.dumps(post, option=orjson.OPT_APPEND_NEWLINE))
+        self._unsynced += 1
+        if self.sync_every and self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush buffered posts and fsync them to disk."""
+        if self._handle is None:
+            return
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._unsynced = 0
 
 
 MAX_BODY_LENGTH = 500
@@ -194,22 +380,20 @@ def _truncate_body(text: str, max_length: int = MAX_BODY_LENGTH) -> str:
     """Truncate post body to max length, ending at a word boundary."""
     if not text or len(text) <= max_length:
         return text
-    # Find last space before max_length to avoid cutting mid-word
+    # Cut at the last space before max_length to avoid cutting mid-word
     truncated = text[:max_length]
-    last_space = truncated.rfind(" ")
-    if last_space > max_length * 0.7:  # Only use space if it's not too far back
-        truncated = truncated[:last_space]
+    head, _, _ = truncated.rpartition(" ")
+    if len(head) > max_length * 0.7:  # Only use space if it's not too far back
+        truncated = head
     return truncated.rstrip() + "..."
 
 
 def format_puzzle_for_api(post: Dict[str, Any], date: Optional[str] = None) -> Dict[str, Any]:
     """Format post data into the puzzle API payload format."""
-    from datetime import datetime
-
     clues = format_clues_for_game(post)
 
     post_body = post.get("redacted_selftext", post.get("selftext", ""))
-    post_body = _truncate_body(post_body)
+    post_body = _truncate_body(str(post_body or ""))
 
     puzzle = {
         "postTitle": post.get("redacted_title", post.get("title", "")),
@@ -221,54 +405,321 @@ def format_puzzle_for_api(post: Dict[str, Any], date: Optional[str] = None) -> D
     return puzzle
 
 
-def save_puzzle_json(puzzle: Dict[str, Any], path: str = "puzzle.json") -> None:
-    """Save puzzle payload to a JSON file."""
-    with open(path, "w", encoding="utf-8") as handle:
-        json.dump(puzzle, handle, indent=2, ensure_ascii=False)
+def save_puzzle_json(puzzle: Dict[str, Any], path: str = "puzzle.json") -> bytes:
+    """Save puzzle payload to a JSON file and return the serialized bytes."""
+    blob = orjson.dumps(puzzle, option=orjson.OPT_INDENT_2)
+    Path(path).write_bytes(blob)
     print(f"Puzzle saved to {path}")
+    return blob
 
 
-def get_interesting_reddit_post(
+@functools.lru_cache(maxsize=1)
+def _default_client() -> OpenAI:
+    """Shared client, so repeated calls reuse one HTTP connection pool."""
+    _load_env()
+    return OpenAI()
+
+
+def _request_kwargs(n: int, model: str, structured: bool = True) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {
+        "model": model,
+        "tools": [{"type": "web_search"}],
+        "instructions": SYSTEM_INSTRUCTIONS,
+        "input": build_prompt(n),
+    }
+    if structured:
+        kwargs["text"] = {"format": RESPONSE_FORMAT}
+    return kwargs
+
+
+def _parse_posts(text: str) -> List[Dict[str, Any]]:
+    """Extract posts from a model response, dropping any that fail validation.
+
+    Raises ValueError if no post survives.
+    """
+    if not text:
+        raise ValueError("Model response was empty.")
+    return _validate_posts(_extract_json(text))
+
+
+def _validate_posts(raw_posts: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    posts = []
+    error: Optional[ValueError] = None
+    for post in raw_posts:
+        try:
+            _ensure_sfw(post)
+            _ensure_min_karma(post)
+        except ValueError as exc:
+            error = exc
+            continue
+        posts.append(post)
+    if not posts:
+        raise error or ValueError("Model response did not contain any posts.")
+    return posts
+
+
+def get_interesting_reddit_posts_single_call(
+    n: int,
     client: Optional[Any] = None,
     model: str = DEFAULT_MODEL,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> List[Dict[str, Any]]:
+    """Fetch up to n posts in a single model call.
+
+    Posts that fail the SFW or karma checks are dropped, so fewer than n
+    posts may be returned. If none survive, or the API is rate limited or
+    unreachable, the call is retried on the same client with exponential
+    backoff, up to max_attempts times.
+    """
+    if client is None:
+        client = _default_client()
+
+    error: Optional[Exception] = None
+    for attempt in range(max_attempts):
+        try:
+            return _fetch_posts(client, n, model)
+        except ValueError as exc:
+            error = exc
+        except TRANSIENT_ERRORS as exc:
+            error = exc
+            if attempt + 1 < max_attempts:
+                time.sleep(RETRY_BACKOFF * 2**attempt)
+    raise error or ValueError("max_attempts must be at least 1.")
+
+
+def _fetch_posts(client: Any, n: int, model: str) -> List[Dict[str, Any]]:
+    try:
+        return _stream_posts(client, n, model)
+    except BadRequestError:
+        # The model rejected the request, e.g. no structured output support:
+        # retry once as plain text. Other API errors propagate.
+        response = client.responses.create(**_request_kwargs(n, model, structured=False))
+        return _parse_posts(_response_text(response))
+
+
+def _text_deltas(stream: Any) -> Iterator[str]:
+    # A generator function rather than a generator expression: mypyc turns
+    # the latter into a list, which would wait for the whole stream.
+    for event in stream:
+        if event.type == "response.output_text.delta":
+            yield event.delta
+
+
+def _stream_posts(client: Any, n: int, model: str) -> List[Dict[str, Any]]:
+    """Stream a response and parse each post while the rest is still arriving."""
+    with client.responses.stream(**_request_kwargs(n, model)) as stream:
+        try:
+            raw_posts = list(_iter_json_objects(_text_deltas(stream)))
+        except ValueError:
+            raw_posts = []
+        if raw_posts:
+            try:
+                return _validate_posts(raw_posts)
+            except ValueError:
+                # Possibly misaligned by stray brackets in prose; the whole-text
+                # parse below is free compared to a retry.
+                pass
+        # Not a shape the incremental parser understands; parse it whole.
+        return _parse_posts(_response_text(stream.get_final_response()))
+
+
+async def _fetch_one(
+    client: Any,
+    sem: asyncio.Semaphore,
+    model: str = DEFAULT_MODEL,
 ) -> Dict[str, Any]:
-    prompt = build_prompt()
+    async with sem:
+        response = await client.responses.create(**_request_kwargs(DEFAULT_CANDIDATES, model))
+    return _parse_posts(_response_text(response))[0]
+
 
+async def get_interesting_reddit_posts(
+    k: int,
+    client: Optional[Any] = None,
+    model: str = DEFAULT_MODEL,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> List[Dict[str, Any]]:
+    """Fetch k posts concurrently, at most `concurrency` requests in flight.
+
+    Slots whose post fails validation, or whose request hit a rate limit or
+    connection error, are re-submitted on their own, up to max_attempts
+    rounds. Raises ValueError if any slot is still empty.
+    """
     if client is None:
+        # Not cached like _default_client: an async client's connections are
+        # bound to the event loop that opened them, so close it before it
+        # outlives that loop.
         _load_env()
-        client = OpenAI()
+        async with AsyncOpenAI() as owned_client:
+            return await _gather_posts(owned_client, k, model, concurrency, max_attempts)
+    return await _gather_posts(client, k, model, concurrency, max_attempts)
+
+
+async def _gather_posts(
+    client: Any,
+    k: int,
+    model: str,
+    concurrency: int,
+    max_attempts: int,
+) -> List[Dict[str, Any]]:
+    sem = asyncio.Semaphore(concurrency)
+    posts: List[Optional[Dict[str, Any]]] = [None] * k
+    pending = list(range(k))
+    error: Optional[Exception] = None
+    for attempt in range(max_attempts):
+        if not pending:
+            break
+        results = await asyncio.gather(
+            *(_fetch_one(client, sem, model) for _ in pending),
+            return_exceptions=True,
+        )
+        failed = []
+        backoff = False
+        for slot, result in zip(pending, results):
+            if isinstance(result, ValueError):
+                error = result
+                failed.append(slot)
+            elif isinstance(result, TRANSIENT_ERRORS):
+                error = result
+                backoff = True
+                failed.append(slot)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                posts[slot] = result
+        pending = failed
+        if backoff and attempt + 1 < max_attempts:
+            await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
+
+    if pending:
+        raise ValueError(
+            f"Could not fetch {len(pending)} of {k} posts after {max_attempts} attempts: {error}"
+        )
+    return [post for post in posts if post is not None]
+
+
+def submit_batch(
+    n: int,
+    jsonl_path: str = "batch_requests.jsonl",
+    client: Optional[Any] = None,
+    model: str = DEFAULT_MODEL,
+) -> Any:
+    """Write n post requests to jsonl_path and submit them to the Batch API.
 
-    response = client.responses.create(
-        model=model,
-        tools=[{"type": "web_search"}],
-        input=prompt,
+    Batch jobs are billed at a discount and have separate rate limits, which
+    suits offline bulk generation. Returns the created batch object.
+    """
+    if client is None:
+        client = _default_client()
+
+    with open(jsonl_path, "wb") as handle:
+        for index in range(n):
+            line = {
+                "custom_id": f"post-{index}",
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": _request_kwargs(DEFAULT_CANDIDATES, model),
+            }
+            handle.write(orjson.dumps(line, option=orjson.OPT_APPEND_NEWLINE))
+
+    with open(jsonl_path, "rb") as handle:
+        batch_file = client.files.create(file=handle, purpose="batch")
+    return client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h",
     )
-    text = _response_text(response)
-    if not text:
-        raise ValueError("Model response was empty.")
-    cleaned = _clean_post(_extract_json(text))
-    _ensure_sfw(cleaned)
-    _ensure_min_karma(cleaned)
-    return cleaned
+
+
+def wait_for_batch(
+    batch_id: str,
+    client: Optional[Any] = None,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+) -> Any:
+    """Poll a batch until it reaches a terminal status and return it."""
+    if client is None:
+        client = _default_client()
+
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in BATCH_TERMINAL_STATUSES:
+            return batch
+        time.sleep(poll_interval)
+
+
+def collect_batch_posts(
+    batch: Any,
+    client: Optional[Any] = None,
+    path: str = DEFAULT_OUTPUT_PATH,
+) -> List[Dict[str, Any]]:
+    """Parse a finished batch's output and append every valid post to path."""
+    if client is None:
+        client = _default_client()
+
+    if not batch.output_file_id:
+        raise ValueError(f"Batch {batch.id} has no output file (status: {batch.status}).")
+
+    posts = []
+    content = client.files.content(batch.output_file_id)
+    with PostSink(path, durable=True) as sink:
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            result = orjson.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                continue
+            try:
+                batch_posts = _parse_posts(_body_text(response.get("body") or {}))
+            except ValueError:
+                continue
+            # Each request asks for spare candidates; keep one post per request.
+            sink.append(batch_posts[0])
+            posts.append(batch_posts[0])
+    return posts
+
+
+def get_interesting_reddit_post(
+    client: Optional[Any] = None,
+    model: str = DEFAULT_MODEL,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    candidates: int = DEFAULT_CANDIDATES,
+) -> Dict[str, Any]:
+    """Fetch one post, asking for spare candidates in case some are rejected."""
+    return get_interesting_reddit_posts_single_call(
+        candidates, client=client, model=model, max_attempts=max_attempts
+    )[0]
 
 
 def main() -> None:
     post = get_interesting_reddit_post()
-    _append_post(post)
+    with PostSink(DEFAULT_OUTPUT_PATH) as sink:
+        sink.append(post)
 
     # Format puzzle for API
     puzzle = format_puzzle_for_api(post)
 
-    # Save to puzzle.json for easy upload
-    save_puzzle_json(puzzle)
-
-    # Print raw post data
-    print("--- Raw Post Data ---")
-    print(json.dumps(post, indent=2))
-
-    # Print puzzle payload ready for API
-    print("\n--- Puzzle Payload (POST to /api/admin/set-puzzle) ---")
-    print(json.dumps(puzzle, indent=2))
+    # Save to puzzle.json for easy upload; reuse the same bytes for printing
+    puzzle_bytes = save_puzzle_json(puzzle)
+
+    # Print raw post data and the puzzle payload ready for API in one write
+    parts = [
+        b"--- Raw Post Data ---\n",
+        orjson.dumps(post, option=orjson.OPT_INDENT_2),
+        b"\n\n--- Puzzle Payload (POST to /api/admin/set-puzzle) ---\n",
+        puzzle_bytes,
+        b"\n",
+    ]
+    sys.stdout.flush()  # keep ordering with anything already printed
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # stdout was replaced by a text-only stream (redirect_stdout, Jupyter, ...)
+        sys.stdout.write(b"".join(parts).decode())
+        sys.stdout.flush()
+    else:
+        buffer.writelines(parts)
+        buffer.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+"""Optional native build of reddit_post_guess for bulk puzzle generation.
+
+Compiles the module with mypyc, so the pure-Python helpers (NSFW check,
+truncation, clue formatting, JSON extraction) run as C from the same source,
+with no duplicate implementations. The source has to stay mypyc-friendly:
+for example, generator expressions are compiled into lists, which is why
+_text_deltas is a generator function. mypyc also enforces annotations at
+runtime, so model fields are coerced before they reach typed helpers.
+
+Build in place with:
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+`import reddit_post_guess` then loads the compiled extension. Running
+`python reddit_post_guess.py` directly still uses the source file.
+"""
+from mypyc.build import mypycify
+from setuptools import setup
+
+setup(
+    name="reddit-post-guess",
+    ext_modules=mypycify(["reddit_post_guess.py"]),
+)
@@ -0,0 +1,58 @@
+import json
+import random
+from types import SimpleNamespace
+
+from reddit_post_guess import _format_subscribers, _stream_posts
+
+
+def _baseline_format_subscribers(count):
+    if count >= 1_000_000:
+        value = f"{count / 1_000_000:.1f}".rstrip("0").rstrip(".")
+        return f"{value}M"
+    if count >= 1_000:
+        value = f"{count / 1_000:.1f}".rstrip("0").rstrip(".")
+        return f"{value}K"
+    return str(count)
+
+
+def test_format_subscribers_matches_float_formatting():
+    rng = random.Random(0)
+    counts = list(range(0, 200_000))
+    counts += [k * 50 for k in range(40_000)]  # every K tie point up to 2M
+    counts += [k * 50_000 for k in range(200_000)]  # every M tie point up to 10^10
+    counts += [rng.randint(0, 10**10) for _ in range(200_000)]
+    counts.append(10**10)
+    for count in counts:
+        assert _format_subscribers(count) == _baseline_format_subscribers(count), count
+
+
+def test_format_subscribers_accepts_integral_floats():
+    assert _format_subscribers(19200000.0) == "19.2M"
+    assert _format_subscribers(1500.0) == "1.5K"
+    assert _format_subscribers(999.0) == "999"
+
+
+class _FakeStream:
+    def __init__(self, text):
+        self.text = text
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def __iter__(self):
+        for index in range(0, len(self.text), 7):
+            delta = self.text[index : index + 7]
+            yield SimpleNamespace(type="response.output_text.delta", delta=delta)
+
+    def get_final_response(self):
+        return SimpleNamespace(output_text=self.text)
+
+
+def test_stream_posts_falls_back_when_prose_brackets_misalign_parser():
+    post = {"title": "A title", "selftext": "Body", "score": 2000}
+    text = "see [note: " + json.dumps({"posts": [post]})
+    client = SimpleNamespace(responses=SimpleNamespace(stream=lambda **kwargs: _FakeStream(text)))
+    assert _stream_posts(client, 1, "model") == [post]